@@ -1,30 +1,87 @@
 # app.py - Production-ready Flask Application
 from flask import Flask, request, jsonify, render_template_string
-from transformers import pipeline
-import hashlib
+from flask.json.provider import JSONProvider
+from werkzeug.exceptions import RequestEntityTooLarge
+from transformers import AutoTokenizer, BartForConditionalGeneration
+from transformers.modeling_outputs import BaseModelOutput
+import torch
+import xxhash
+from cachetools import TTLCache
+from prometheus_client import Counter, generate_latest, CONTENT_TYPE_LATEST
 import redis
 import logging
 from functools import wraps
 import time
-import json
+import orjson
+import os
+import queue
+import threading
+import bisect
+import itertools
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from validate_scan import scan_text
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'WARNING').upper())
 logger = logging.getLogger(__name__)
 
+
+# JSON serialization
+class OrjsonProvider(JSONProvider):
+    """Serialize API responses with orjson instead of the stdlib json module"""
+    mimetype = 'application/json'
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype=self.mimetype)
+
+
+# Input limits
+MAX_TEXT_LENGTH = 10000
+# JSON body ceiling: a non-BMP character (e.g. emoji) may be escaped as a
+# surrogate pair (\ud83d\ude00, 12 bytes). The slack covers the JSON envelope and
+# surrounding whitespace, which is stripped before the length check.
+MAX_REQUEST_BYTES = MAX_TEXT_LENGTH * 12 + 16 * 1024
+
+
 app = Flask(__name__)
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max
+app.json = OrjsonProvider(app)
+# /api/summarize is the only POST route; this also bounds chunked uploads
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BYTES
 
 # Redis configuration (use environment variables in production)
+# Prefer a local Unix socket when REDIS_SOCK is set, otherwise fall back to TCP
+REDIS_SOCK = os.environ.get('REDIS_SOCK')
+if REDIS_SOCK:
+    redis_connection = {
+        'connection_class': redis.UnixDomainSocketConnection,
+        'path': REDIS_SOCK
+    }
+else:
+    redis_connection = {
+        'host': os.environ.get('REDIS_HOST', 'localhost'),
+        'port': int(os.environ.get('REDIS_PORT', 6379))
+    }
+
 try:
-    redis_client = redis.Redis(
-        host='localhost',
-        port=6379,
+    # One pool shared by all request threads; blocks instead of erroring when exhausted
+    redis_pool = redis.BlockingConnectionPool(
+        max_connections=64,
+        timeout=5,
         db=0,
-        decode_responses=True,
-        socket_timeout=5
+        decode_responses=False,  # Cached responses are served as raw bytes
+        socket_timeout=5,
+        **redis_connection
     )
+    redis_client = redis.Redis(connection_pool=redis_pool)
     redis_client.ping()
     REDIS_AVAILABLE = True
     logger.info("Redis connected successfully")
@@ -32,12 +89,80 @@ except:
     REDIS_AVAILABLE = False
     logger.warning("Redis not available - caching disabled")
 
+# After a connection failure, skip Redis for a while instead of letting every
+# request wait out its own socket timeout
+REDIS_RETRY_AFTER = 30  # seconds
+redis_degraded_until = 0.0
+
+
+def safe_redis(command, *args, **kwargs):
+    """Run a Redis command, returning None while Redis is marked as down"""
+    global redis_degraded_until
+    if time.monotonic() < redis_degraded_until:
+        return None
+    
+    try:
+        return command(*args, **kwargs)
+    except (redis.ConnectionError, redis.TimeoutError) as e:
+        redis_degraded_until = time.monotonic() + REDIS_RETRY_AFTER
+        logger.error(f"Redis unreachable, bypassing it for {REDIS_RETRY_AFTER}s: {e}")
+        return None
+
+
+# Model configuration
+MODEL_NAME = "facebook/bart-large-cnn"
+# 'torch' runs the fp32 model; 'onnx' runs an int8-quantized ONNX Runtime export
+MODEL_BACKEND = os.environ.get('MODEL_BACKEND', 'torch')
+ONNX_MODEL_DIR = os.environ.get('ONNX_MODEL_DIR', 'models/bart-large-cnn-onnx-int8')
+# The torch backend runs on GPU in fp16 when CUDA is available; ONNX stays on CPU
+MODEL_DEVICE = 'cuda' if MODEL_BACKEND == 'torch' and torch.cuda.is_available() else 'cpu'
+# torch defaults to one thread per physical core; leave one of those free for
+# the request threads doing tokenization and I/O
+MODEL_THREADS = int(os.environ.get('MODEL_THREADS', max(1, torch.get_num_threads() - 1)))
+MODEL_WARMUP = os.environ.get('MODEL_WARMUP', '1') == '1'
+# Opt-in torch.compile; compiled kernels persist in TORCHINDUCTOR_CACHE_DIR across restarts
+TORCH_COMPILE = os.environ.get('TORCH_COMPILE') == '1'
+
+# Batching configuration
+BATCH_MAX_SIZE = 8      # Max requests per forward pass
+BATCH_WAIT = 0.05       # Seconds to wait for more requests to join a batch
+REQUEST_TIMEOUT = 120   # Seconds a request waits for its summary
+BATCH_LOOKAHEAD = 4 * BATCH_MAX_SIZE  # Queued requests considered when choosing a batch
+MAX_BATCH_SKIPS = 3     # Batches a request can be passed over before it goes next
+
+# Token-length buckets (upper bounds); batches are formed within a bucket so
+# short inputs are not padded out to the longest request in the queue
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024)
+BUCKET_MIX_RATIO = 0.8  # Shorter inputs may join a batch if >= 80% of its longest
+
+# Encoder states kept for reuse when the same text is summarized at another length
+ENCODER_CACHE_SIZE = 64
+
+
+class SummaryJob:
+    """A single summarization request waiting on the batch worker"""
+    def __init__(self, input_ids, max_length, min_length):
+        self.input_ids = input_ids
+        self.config = (max_length, min_length)
+        self.num_tokens = len(input_ids)
+        self.bucket = bisect.bisect_left(TOKEN_BUCKETS, self.num_tokens)
+        self.skipped = 0  # Batches formed without this job while it was pending
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.cancelled = False  # Set when the caller stops waiting
+
 
 # Singleton Model Manager
 class ModelManager:
     """Ensures model is loaded once and reused across requests"""
     _instance = None
     _model = None
+    _tokenizer = None
+    _encoder_cache = None  # Only touched by the batch worker thread
+    _queue = None
+    _worker = None
+    _lock = threading.Lock()
     
     def __new__(cls):
         if cls._instance is None:
@@ -46,44 +171,282 @@ class ModelManager:
     
     def get_model(self):
         if self._model is None:
-            logger.info("Loading BART model...")
-            start = time.time()
-            self._model = pipeline(
-                "summarization",
-                model="facebook/bart-large-cnn",
-                device=-1  # Use CPU, change to 0 for GPU
-            )
-            logger.info(f"Model loaded in {time.time() - start:.2f}s")
+            with self._lock:
+                if self._model is None:
+                    logger.info(f"Loading BART model ({MODEL_BACKEND} backend, {MODEL_DEVICE})...")
+                    start = time.time()
+                    self._tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+                    if MODEL_BACKEND == 'onnx':
+                        self._model = self._load_quantized_model()
+                    else:
+                        torch.set_num_threads(MODEL_THREADS)
+                        dtype = torch.float16 if MODEL_DEVICE == 'cuda' else torch.float32
+                        self._model = BartForConditionalGeneration.from_pretrained(
+                            MODEL_NAME,
+                            torch_dtype=dtype
+                        ).to(MODEL_DEVICE)
+                        if TORCH_COMPILE:
+                            os.environ.setdefault(
+                                'TORCHINDUCTOR_CACHE_DIR',
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'torchinductor')
+                            )
+                            # generate() calls forward(), so compiling it covers every decoding step
+                            self._model.forward = torch.compile(
+                                self._model.forward,
+                                mode='reduce-overhead'
+                            )
+                    logger.info(f"Model loaded in {time.time() - start:.2f}s")
         return self._model
+    
+    def get_tokenizer(self):
+        self.get_model()
+        return self._tokenizer
+    
+    def _load_quantized_model(self):
+        """Load the int8 ONNX model, exporting and quantizing it on first use"""
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        import onnxruntime
+        
+        onnx_files = ('encoder_model', 'decoder_model', 'decoder_with_past_model')
+        
+        if not os.path.exists(os.path.join(ONNX_MODEL_DIR, 'decoder_with_past_model_quantized.onnx')):
+            logger.info("Exporting and quantizing BART to ONNX (one-time)...")
+            export_dir = f"{ONNX_MODEL_DIR}-fp32"
+            exported = ORTModelForSeq2SeqLM.from_pretrained(MODEL_NAME, export=True)
+            exported.save_pretrained(export_dir)
+            exported.generation_config.save_pretrained(ONNX_MODEL_DIR)
+            
+            # Dynamic quantization: int8 weights, activations quantized at runtime
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            for name in onnx_files:
+                quantizer = ORTQuantizer.from_pretrained(export_dir, file_name=f"{name}.onnx")
+                quantizer.quantize(save_dir=ONNX_MODEL_DIR, quantization_config=qconfig)
+        
+        session_options = onnxruntime.SessionOptions()
+        session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session_options.intra_op_num_threads = MODEL_THREADS
+        
+        return ORTModelForSeq2SeqLM.from_pretrained(
+            ONNX_MODEL_DIR,
+            encoder_file_name='encoder_model_quantized.onnx',
+            decoder_file_name='decoder_model_quantized.onnx',
+            decoder_with_past_file_name='decoder_with_past_model_quantized.onnx',
+            provider='CPUExecutionProvider',
+            session_options=session_options
+        )
+    
+    def summarize(self, text, max_length, min_length, timeout=REQUEST_TIMEOUT):
+        """Tokenize text, queue it for the batch worker and wait for its summary"""
+        self._ensure_worker()
+        
+        # Tokenize once on arrival; the worker buckets by length and reuses the ids
+        input_ids = self.get_tokenizer()(text, truncation=True)['input_ids']
+        
+        job = SummaryJob(input_ids, max_length, min_length)
+        self._queue.put(job)
+        
+        if not job.done.wait(timeout):
+            # The worker drops cancelled jobs instead of spending model time on them
+            job.cancelled = True
+            raise TimeoutError(f"Summarization timed out after {timeout}s")
+        if job.error is not None:
+            raise job.error
+        return job.result
+    
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._queue = queue.Queue()
+                    self._encoder_cache = OrderedDict()
+                    self._worker = threading.Thread(
+                        target=self._run_batches,
+                        name="summary-batcher",
+                        daemon=True
+                    )
+                    self._worker.start()
+    
+    def _run_batches(self):
+        """Collect requests arriving within BATCH_WAIT into shared model calls"""
+        pending = []
+        while True:
+            if pending:
+                # Leftovers have already waited; only pick up what has arrived
+                deadline = time.monotonic()
+            else:
+                pending.append(self._queue.get())
+                deadline = time.monotonic() + BATCH_WAIT
+            
+            # Wait up to the deadline for a full batch, then take whatever else
+            # is queued so the fullest group is chosen from a wider window
+            while len(pending) < BATCH_LOOKAHEAD:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0 and len(pending) < BATCH_MAX_SIZE:
+                        pending.append(self._queue.get(timeout=remaining))
+                    else:
+                        pending.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # Skip requests whose callers already timed out
+            pending = [job for job in pending if not job.cancelled]
+            if not pending:
+                continue
+            
+            batch = self._next_batch(pending)
+            for job in batch:
+                pending.remove(job)
+            for job in pending:
+                job.skipped += 1
+            
+            max_length, min_length = batch[0].config
+            self._run_batch(batch, max_length, min_length)
+    
+    def _next_batch(self, pending):
+        """Pick the fullest (config, token bucket) group from pending jobs"""
+        groups = {}
+        for job in pending:
+            groups.setdefault((job.config, job.bucket), []).append(job)
+        
+        # Don't let a lone request starve behind busier buckets; counting skipped
+        # batches rather than seconds keeps this independent of model speed
+        starved = max(pending, key=lambda job: job.skipped)
+        if starved.skipped >= MAX_BATCH_SKIPS:
+            key = (starved.config, starved.bucket)
+        else:
+            key = max(groups, key=lambda k: len(groups[k]))
+        
+        config, bucket = key
+        batch = groups[key][:BATCH_MAX_SIZE]
+        longest = max(job.num_tokens for job in batch)
+        
+        # Top up from shorter buckets only where padding to `longest` is cheap
+        shorter = sorted(
+            (job for job in pending
+             if job.config == config and job.bucket < bucket),
+            key=lambda job: job.num_tokens,
+            reverse=True
+        )
+        for job in shorter:
+            if len(batch) >= BATCH_MAX_SIZE or job.num_tokens < BUCKET_MIX_RATIO * longest:
+                break
+            batch.append(job)
+        
+        return batch
+    
+    def _run_batch(self, batch, max_length, min_length):
+        try:
+            model = self.get_model()
+            tokenizer = self.get_tokenizer()
+            inputs = tokenizer.pad(
+                {'input_ids': [job.input_ids for job in batch]},
+                padding='longest',
+                return_tensors='pt'
+            ).to(MODEL_DEVICE)
+            with torch.inference_mode():
+                encoder_outputs = self._encode(model, batch, inputs)
+                output_ids = model.generate(
+                    encoder_outputs=encoder_outputs,
+                    attention_mask=inputs['attention_mask'],
+                    max_length=max_length,
+                    min_length=min_length,
+                    do_sample=False
+                )
+            summaries = tokenizer.batch_decode(
+                output_ids,
+                skip_special_tokens=True,
+                clean_up_tokenization_spaces=False
+            )
+        except Exception as e:
+            logger.error(f"Batch inference error: {e}")
+            for job in batch:
+                job.error = e
+                job.done.set()
+            return
+        
+        # generate returns one sequence per input row, in input order
+        for job, summary in zip(batch, summaries):
+            job.result = summary
+            job.done.set()
+    
+    def _encode(self, model, batch, inputs):
+        """Build the batch's encoder states, only encoding inputs not seen recently"""
+        cache = self._encoder_cache
+        keys = [tuple(job.input_ids) for job in batch]
+        missing = [i for i, key in enumerate(keys) if key not in cache]
+        
+        if missing:
+            hidden = model.get_encoder()(
+                input_ids=inputs['input_ids'][missing],
+                attention_mask=inputs['attention_mask'][missing]
+            ).last_hidden_state
+            for row, i in enumerate(missing):
+                # Padding is on the right, so the first num_tokens rows are the input's
+                cache[keys[i]] = hidden[row, :batch[i].num_tokens].clone()
+        
+        states = [cache[key] for key in keys]
+        for key in keys:
+            cache.move_to_end(key)
+        while len(cache) > ENCODER_CACHE_SIZE:
+            cache.popitem(last=False)
+        
+        # Re-pad to the batch length; padded positions are masked out by attention_mask
+        longest = inputs['input_ids'].shape[1]
+        last_hidden_state = states[0].new_zeros((len(states), longest, states[0].shape[-1]))
+        for row, state in enumerate(states):
+            last_hidden_state[row, :state.shape[0]] = state
+        return BaseModelOutput(last_hidden_state=last_hidden_state)
 
 
 model_manager = ModelManager()
 
 
 # Rate Limiting Decorator
+# Sliding-window log: one atomic round-trip evicts requests older than the
+# window, counts the rest and records this request if it is allowed.
+# ARGV: now (microseconds), window (seconds), max_requests, unique member
+RATE_LIMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - tonumber(ARGV[2]) * 1000000)
+local count = redis.call('ZCARD', KEYS[1])
+if count < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return count + 1
+"""
+rate_limit_ids = itertools.count()
+
+
 def rate_limit(max_requests=10, window=60):
     """Rate limit: max_requests per window (seconds)"""
     def decorator(f):
+        count_request = redis_client.register_script(RATE_LIMIT_SCRIPT) if REDIS_AVAILABLE else None
+        
         @wraps(f)
         def wrapped(*args, **kwargs):
             if not REDIS_AVAILABLE:
                 return f(*args, **kwargs)
             
             ip = request.remote_addr
-            key = f"rate_limit:{ip}"
+            key = f"rate_limit:window:{ip}"
             
             try:
-                current = redis_client.get(key)
-                if current and int(current) >= max_requests:
+                # Microseconds keep scores exact in Lua's double-precision numbers
+                now = time.time_ns() // 1000
+                member = f"{now}:{next(rate_limit_ids)}"
+                current = safe_redis(
+                    count_request,
+                    keys=[key],
+                    args=[now, window, max_requests, member]
+                )
+                if current is not None and current > max_requests:
                     return jsonify({
                         'error': 'Rate limit exceeded',
                         'message': f'Max {max_requests} requests per {window}s'
                     }), 429
-                
-                pipe = redis_client.pipeline()
-                pipe.incr(key)
-                pipe.expire(key, window)
-                pipe.execute()
             except Exception as e:
                 logger.error(f"Rate limit error: {e}")
             
@@ -93,113 +456,144 @@ def rate_limit(max_requests=10, window=60):
 
 
 # Caching utilities
+# Precomputed key prefixes; Redis accepts bytes keys, so no str formatting per request
+CACHE_KEY_PREFIXES = {
+    'short': b'summary:short:',
+    'medium': b'summary:medium:',
+    'long': b'summary:long:'
+}
+
+
 def get_cache_key(text, length):
     """Generate cache key from text and summary length"""
-    content = f"{text[:1000]}:{length}"  # Use first 1000 chars for key
-    return f"summary:{hashlib.md5(content.encode()).hexdigest()}"
+    # xxh3 is fast enough to hash the full text, avoiding prefix collisions
+    digest = xxhash.xxh3_64(text.encode('utf-8', 'surrogatepass')).hexdigest()
+    return CACHE_KEY_PREFIXES[length] + digest.encode('ascii')
+
+
+# In-process cache in front of Redis; Redis stays the source of truth across workers
+local_cache = TTLCache(maxsize=1024, ttl=3600)
+local_cache_lock = threading.Lock()
 
+# Cache metrics, exposed at /metrics
+CACHE_HITS = Counter('summarizer_cache_hits_total', 'Summary cache hits', ['tier'])
+CACHE_HITS_LOCAL = CACHE_HITS.labels('local')
+CACHE_HITS_REDIS = CACHE_HITS.labels('redis')
+CACHE_MISSES = Counter('summarizer_cache_misses_total', 'Summary cache misses')
 
-def get_cached_summary(text, length):
-    """Retrieve cached summary if available"""
+
+def get_cached_summary(key):
+    """Retrieve the cached, already-serialized API response if available"""
+    with local_cache_lock:
+        cached = local_cache.get(key)
+    if cached:
+        CACHE_HITS_LOCAL.inc()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Cache hit (local) %s", key)
+        return cached
+    
     if not REDIS_AVAILABLE:
+        CACHE_MISSES.inc()
         return None
     
     try:
-        key = get_cache_key(text, length)
-        cached = redis_client.get(key)
+        cached = safe_redis(redis_client.get, key)
         if cached:
-            logger.info("Cache hit")
-            return json.loads(cached)
+            CACHE_HITS_REDIS.inc()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Cache hit %s", key)
+            with local_cache_lock:
+                local_cache[key] = cached
+            return cached
     except Exception as e:
         logger.error(f"Cache retrieval error: {e}")
     
+    CACHE_MISSES.inc()
     return None
 
 
-def cache_summary(text, length, summary_data):
-    """Cache summary for 24 hours"""
+def cache_summary(key, summary_data):
+    """Cache the serialized API response locally and in Redis for 24 hours"""
+    # Store the full response envelope so cache hits skip JSON entirely
+    envelope = orjson.dumps({'success': True, 'data': {**summary_data, 'cached': True}})
+    with local_cache_lock:
+        local_cache[key] = envelope
+    
     if not REDIS_AVAILABLE:
         return
     
     try:
-        key = get_cache_key(text, length)
-        redis_client.setex(
+        safe_redis(
+            redis_client.setex,
             key,
             86400,  # 24 hours
-            json.dumps(summary_data)
+            envelope
         )
-        logger.info("Summary cached")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Summary cached %s", key)
     except Exception as e:
         logger.error(f"Cache storage error: {e}")
 
 
+# Summary length options: (max_length, min_length) in tokens
+LENGTH_CONFIG = {
+    'short': (50, 20),
+    'medium': (130, 30),
+    'long': (250, 50)
+}
+
+
 # Input validation
-def validate_input(text, length):
+def validate_input(text, length, word_count):
     """Validate and sanitize input"""
     errors = []
     
-    if not text or not text.strip():
+    if not text or word_count == 0:
         errors.append("Text cannot be empty")
     
-    if len(text) > 10000:
+    if len(text) > MAX_TEXT_LENGTH:
         errors.append("Text too long (max 10,000 characters)")
     
-    if len(text.split()) < 30:
+    if word_count < 30:
         errors.append("Text too short (minimum 30 words)")
     
-    if length not in ['short', 'medium', 'long']:
+    if length not in LENGTH_CONFIG:
         errors.append("Invalid length option")
     
     return errors
 
 
 # Summarization logic
-def generate_summary(text, length='medium'):
+def generate_summary(text, length='medium', cache_key=None, word_count=None):
     """Generate summary with error handling"""
     try:
-        # Check cache first
-        cached = get_cached_summary(text, length)
-        if cached:
-            cached['cached'] = True
-            return cached
-        
-        # Configure summary parameters
-        length_config = {
-            'short': {'max_length': 50, 'min_length': 20},
-            'medium': {'max_length': 130, 'min_length': 30},
-            'long': {'max_length': 250, 'min_length': 50}
-        }
-        
-        config = length_config.get(length, length_config['medium'])
+        # validate_input has already rejected unknown lengths
+        max_length, min_length = LENGTH_CONFIG[length]
         
-        # Get model and generate
-        model = model_manager.get_model()
+        # Generate through the batch worker, which groups concurrent requests
         start_time = time.time()
         
-        result = model(
+        summary_text = model_manager.summarize(
             text,
-            max_length=config['max_length'],
-            min_length=config['min_length'],
-            do_sample=False,
-            truncation=True
+            max_length=max_length,
+            min_length=min_length
         )
         
         inference_time = time.time() - start_time
-        summary_text = result[0]['summary_text']
         
         # Prepare response
         response = {
             'summary': summary_text,
-            'original_length': len(text.split()),
+            'original_length': word_count if word_count is not None else len(text.split()),
             'summary_length': len(summary_text.split()),
             'compression_ratio': round(len(summary_text) / len(text) * 100, 1),
             'inference_time': round(inference_time, 2),
             'cached': False,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': datetime.utcnow()
         }
         
         # Cache the result
-        cache_summary(text, length, response)
+        cache_summary(cache_key or get_cache_key(text, length), response)
         
         return response
         
@@ -219,21 +613,47 @@ def home():
 def summarize():
     """Main API endpoint for text summarization"""
     try:
-        data = request.get_json()
+        # Reject oversize bodies before reading or parsing them
+        if request.content_length and request.content_length > MAX_REQUEST_BYTES:
+            return jsonify({'error': 'Text too long (max 10,000 characters)'}), 413
+        
+        try:
+            raw = request.get_data(cache=False)
+        except RequestEntityTooLarge:
+            raw = None
+        # Werkzeug stops reading bodies without a Content-Length (chunked uploads)
+        # at MAX_CONTENT_LENGTH, so a body that fills the limit was cut off
+        if raw is None or len(raw) >= MAX_REQUEST_BYTES:
+            return jsonify({'error': 'Text too long (max 10,000 characters)'}), 413
+        
+        try:
+            data = orjson.loads(raw) if raw else None
+        except orjson.JSONDecodeError:
+            return jsonify({'error': 'Invalid JSON'}), 400
         
-        if not data:
+        if not data or not isinstance(data, dict):
             return jsonify({'error': 'No JSON data provided'}), 400
         
-        text = data.get('text', '').strip()
+        text = data.get('text', '')
         length = data.get('length', 'medium').lower()
         
+        # One pass counts words and finds the text's bounds, replacing strip()
+        word_count, first, last = scan_text(text)
+        text = text[first:last + 1] if last >= 0 else ''
+        
         # Validate input
-        errors = validate_input(text, length)
+        errors = validate_input(text, length, word_count)
         if errors:
             return jsonify({'error': errors[0]}), 400
         
+        # Serve cache hits as stored bytes, without decoding or re-encoding
+        cache_key = get_cache_key(text, length)
+        cached = get_cached_summary(cache_key)
+        if cached:
+            return app.response_class(cached, mimetype='application/json'), 200
+        
         # Generate summary
-        result = generate_summary(text, length)
+        result = generate_summary(text, length, cache_key, word_count)
         
         return jsonify({
             'success': True,
@@ -254,13 +674,18 @@ def health_check():
     """Health check endpoint for monitoring"""
     try:
         model = model_manager.get_model()
-        redis_status = "connected" if REDIS_AVAILABLE else "disconnected"
+        if not REDIS_AVAILABLE:
+            redis_status = "disconnected"
+        elif time.monotonic() < redis_degraded_until:
+            redis_status = "degraded"
+        else:
+            redis_status = "connected"
         
         return jsonify({
             'status': 'healthy',
             'model_loaded': model is not None,
             'redis': redis_status,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': datetime.utcnow()
         }), 200
     except Exception as e:
         return jsonify({
@@ -276,9 +701,15 @@ def get_stats():
         return jsonify({'error': 'Redis not available'}), 503
     
     try:
-        info = redis_client.info()
+        # Both calls fail fast while Redis is being bypassed after an outage
+        info = safe_redis(redis_client.info)
+        cache_keys = safe_redis(redis_client.dbsize) if info is not None else None
+        if info is None or cache_keys is None:
+            return jsonify({'error': 'Redis unreachable'}), 503
+        
         return jsonify({
-            'cache_keys': redis_client.dbsize(),
+            'cache_keys': cache_keys,
+            'local_cache_keys': len(local_cache),
             'memory_used': info.get('used_memory_human', 'N/A'),
             'connected_clients': info.get('connected_clients', 0)
         }), 200
@@ -286,6 +717,12 @@ def get_stats():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics endpoint"""
+    return app.response_class(generate_latest(), content_type=CONTENT_TYPE_LATEST)
+
+
 # HTML Template with modern UI
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
@@ -616,9 +1053,29 @@ HTML_TEMPLATE = '''
 '''
 
 
+# Model warm-up
+def warm_up():
+    """Load the model and run one short summary so real traffic never pays for it"""
+    try:
+        scan_text("warm up")
+        model_manager.summarize("warmup text " * 10, *LENGTH_CONFIG['short'])
+        logger.info("Model warm-up complete")
+    except Exception as e:
+        logger.error(f"Model warm-up failed: {e}")
+
+
+if MODEL_WARMUP:
+    threading.Thread(target=warm_up, name="model-warmup", daemon=True).start()
+
+
 # ...existing code...
 if __name__ == '__main__':
-    # Do not preload the model at startup — it will load on first request.
-    logger.info("Application ready! (model will load on first request)")
-    app.run(debug=False, host='0.0.0.0', port=5000)
+    if os.getenv('FLASK_DEV'):
+        logger.info("Application ready! (model is warming up in the background)")
+        app.run(debug=False, host='0.0.0.0', port=5000, threaded=True)
+    else:
+        logger.warning(
+            "Run 'gunicorn -c gunicorn_conf.py app:app' in production, "
+            "or set FLASK_DEV=1 to use the development server"
+        )
 # ...existing code...
\ No newline at end of file
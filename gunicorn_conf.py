@@ -0,0 +1,13 @@
+# gunicorn_conf.py - Production server configuration
+# A single worker keeps one copy of the model in RAM; its threads let
+# concurrent requests reach the batch worker together so they share a
+# forward pass instead of queueing behind each other.
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = 1
+worker_class = 'gthread'
+threads = 32
+timeout = 120
+accesslog = '-'
+errorlog = '-'
@@ -18,7 +18,7 @@ if exist requirements.txt (
 )
 
 echo Starting server...
-start "" cmd /c ".venv\Scripts\waitress-serve --listen=0.0.0.0:5000 app:app"
+start "" cmd /c ".venv\Scripts\waitress-serve --listen=0.0.0.0:5000 --threads=32 app:app"
 
 timeout /t 2 /nobreak >nul
 start "" "http://localhost:5000"
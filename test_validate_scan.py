@@ -0,0 +1,52 @@
+# test_validate_scan.py - scan_text must agree with str.split() / str.strip()
+import pytest
+
+import validate_scan
+from validate_scan import scan_text
+
+CASES = [
+    '',
+    '   ',
+    'one',
+    '  two words  ',
+    'tabs\tand\nnewlines\r\nhere',
+    'a\x1cb\x1dc\x1ed\x1fe',
+    'a\x0bb\x0cc',
+    'non\xa0breaking\xa0spaces',
+    'thin space and ideographic　space',
+    'next\x85line',
+    '\xa0 padded 　',
+    'héllo  wörld\t!',
+]
+
+
+def expected(text):
+    stripped = text.strip()
+    if not stripped:
+        return len(text.split()), -1, -1
+    first = text.index(stripped)
+    return len(text.split()), first, first + len(stripped) - 1
+
+
+@pytest.mark.parametrize('text', CASES)
+def test_scan_matches_str_builtins(text):
+    assert scan_text(text) == expected(text)
+
+
+@pytest.mark.parametrize('text', CASES)
+def test_python_fallback_matches_str_builtins(text):
+    assert validate_scan._scan_python(text) == expected(text)
+
+
+@pytest.mark.skipif(not validate_scan.NUMBA_AVAILABLE, reason="numba not installed")
+@pytest.mark.parametrize('text', [
+    'a\x1cb\x1dc\x1ed\x1fe',
+    '\x1c\x1d padded \x1e\x1f',
+    'mixed\x1fcontrol\tand\x1cspace',
+])
+def test_numba_scan_splits_on_ascii_separators(text):
+    import numpy as np
+    
+    assert text.isascii()
+    buf = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    assert validate_scan._scan_numba(buf) == expected(text)
@@ -0,0 +1,49 @@
+# validate_scan.py - Single-pass text scan for input validation
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _scan_python(text):
+    """Fallback using str builtins (each runs in C, but over several passes)"""
+    last = len(text.rstrip()) - 1
+    first = len(text) - len(text.lstrip()) if last >= 0 else -1
+    return len(text.split()), first, last
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _scan_numba(buf):
+        words = 0
+        first = -1
+        last = -1
+        in_word = False
+        for i in range(buf.shape[0]):
+            b = buf[i]
+            # The ASCII characters str.isspace() accepts, so counts match str.split()
+            if b == 32 or 9 <= b <= 13 or 28 <= b <= 31:
+                in_word = False
+            else:
+                if not in_word:
+                    words += 1
+                    in_word = True
+                if first < 0:
+                    first = i
+                last = i
+        return words, first, last
+
+
+def scan_text(text):
+    """Scan text once and return (word_count, first, last).
+
+    word_count equals len(text.split()). first/last are the indices of the
+    first and last non-whitespace characters, so text[first:last + 1] equals
+    text.strip(); both are -1 when the text is empty or all whitespace.
+    Non-ASCII text uses str builtins, which know every Unicode space.
+    """
+    if NUMBA_AVAILABLE and text.isascii():
+        return _scan_numba(np.frombuffer(text.encode('ascii'), dtype=np.uint8))
+    return _scan_python(text)